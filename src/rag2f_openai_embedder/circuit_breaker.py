@@ -0,0 +1,147 @@
+"""Circuit breaker protecting callers from upstream embedding outages.
+
+While the upstream API is healthy the breaker is *closed* and every call goes
+through. When the failure rate over the last calls (slow calls count as
+failures) exceeds the threshold, the breaker *opens* and calls fail at once
+instead of waiting for ``timeout * max_retries``. After ``open_seconds`` the
+breaker becomes *half-open* and lets a few probe calls through: if they
+succeed it closes again, otherwise it re-opens.
+
+Every state change starts a new generation. ``allow()`` returns the current
+generation as a token and ``record()`` ignores results carrying an older one,
+so a slow call admitted before the breaker opened cannot be mistaken for a
+half-open probe.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker based on failure rate and latency."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        slow_call_seconds: float | None = None,
+        half_open_probes: int = 1,
+    ):
+        """Initialize the breaker.
+
+        Args:
+            failure_rate: Fraction of failed calls in the window that opens the breaker
+            window: Number of most recent calls considered
+            min_calls: Minimum number of calls in the window before the rate is evaluated
+            open_seconds: Time the breaker stays open before probing for recovery
+            slow_call_seconds: Calls slower than this count as failures (None disables)
+            half_open_probes: Successful probes needed to close the breaker again
+
+        Raises:
+            ValueError: If the settings would prevent the breaker from ever opening
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError(f"failure_rate must be in (0, 1], got: {failure_rate}")
+        if min_calls > window:
+            raise ValueError(f"min_calls ({min_calls}) must not exceed window ({window})")
+        self._failure_rate = failure_rate
+        self._min_calls = min_calls
+        self._open_seconds = open_seconds
+        self._slow_call_seconds = slow_call_seconds
+        self._half_open_probes = half_open_probes
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._generation = 1
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Return the current state: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def _maybe_half_open(self, now: float) -> None:
+        if self._state == self.OPEN and now - self._opened_at >= self._open_seconds:
+            self._state = self.HALF_OPEN
+            self._generation += 1
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+            logger.info("Circuit breaker half-open, probing upstream")
+
+    def _open(self, now: float) -> None:
+        self._state = self.OPEN
+        self._generation += 1
+        self._opened_at = now
+        self._outcomes.clear()
+        logger.warning("Circuit breaker open for %.1fs", self._open_seconds)
+
+    def allow(self) -> int | None:
+        """Return a token if a call may go upstream now, None if it is rejected.
+
+        In the half-open state only ``half_open_probes`` concurrent probes are
+        allowed; every allowed call must be followed by ``record()`` with the
+        returned token.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return self._generation
+            self._maybe_half_open(time.monotonic())
+            if self._state == self.HALF_OPEN and self._probes_in_flight < self._half_open_probes:
+                self._probes_in_flight += 1
+                return self._generation
+            return None
+
+    def record(self, token: int, success: bool, elapsed: float = 0.0) -> None:
+        """Record the outcome of an allowed call.
+
+        Results from an earlier generation (e.g. a call admitted before the
+        breaker opened) are ignored.
+
+        Args:
+            token: Token returned by ``allow()`` for this call
+            success: Whether the upstream call succeeded
+            elapsed: Call duration in seconds
+        """
+        failed = not success or (
+            self._slow_call_seconds is not None and elapsed >= self._slow_call_seconds
+        )
+        with self._lock:
+            if token != self._generation:
+                return
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed:
+                    self._open(now)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self._half_open_probes:
+                    self._state = self.CLOSED
+                    self._generation += 1
+                    self._outcomes.clear()
+                    logger.info("Circuit breaker closed, upstream recovered")
+                return
+            self._outcomes.append(failed)
+            if (
+                len(self._outcomes) >= self._min_calls
+                and sum(self._outcomes) / len(self._outcomes) >= self._failure_rate
+            ):
+                self._open(now)
@@ -0,0 +1,87 @@
+"""Shared OpenAI clients and rate limiters for embedders of the same plugin.
+
+Every embedding profile registered by the plugin gets its clients and limiters
+from one ``ClientPool``: profiles using the same API key and endpoint share a
+single HTTP connection pool, and profiles using the same API key share a
+single quota-aware ``RateLimiter``.
+"""
+
+import logging
+import threading
+
+from openai import OpenAI
+
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class ClientPool:
+    """Thread-safe registry of OpenAI clients and rate limiters."""
+
+    def __init__(self):
+        self._clients: dict[tuple[str | None, str | None], OpenAI] = {}
+        self._limiters: dict[str | None, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def client(
+        self,
+        api_key: str | None,
+        base_url: str | None,
+        timeout: float,
+        max_retries: int,
+    ) -> OpenAI:
+        """Return a client for ``(api_key, base_url)`` sharing the pooled HTTP client.
+
+        Args:
+            api_key: OpenAI API key (None to use the SDK default)
+            base_url: Custom API endpoint (None for OpenAI's official API)
+            timeout: Request timeout for the returned client
+            max_retries: Maximum number of retries for the returned client
+        Returns:
+            An OpenAI client with the requested options
+        """
+        key = (api_key, base_url)
+        with self._lock:
+            base = self._clients.get(key)
+            if base is None:
+                client_kwargs = {"timeout": timeout, "max_retries": max_retries}
+                if base_url:
+                    client_kwargs["base_url"] = base_url
+                if api_key:
+                    client_kwargs["api_key"] = api_key
+                base = OpenAI(**client_kwargs)
+                self._clients[key] = base
+                return base
+        # with_options() reuses the underlying HTTP client of the base client
+        return base.with_options(timeout=timeout, max_retries=max_retries)
+
+    def limiter(self, api_key: str | None, rpm: int | None, tpm: int | None) -> RateLimiter | None:
+        """Return the rate limiter shared by all embedders using ``api_key``.
+
+        The first caller configuring limits for a key creates the limiter; later
+        callers reuse it regardless of the limits they pass.
+
+        Args:
+            api_key: OpenAI API key
+            rpm: Maximum requests per minute
+            tpm: Maximum tokens per minute
+        Returns:
+            The shared limiter, or None if no limit is configured for the key
+        """
+        with self._lock:
+            limiter = self._limiters.get(api_key)
+            if limiter is None:
+                if not rpm and not tpm:
+                    return None
+                limiter = RateLimiter(rpm=rpm, tpm=tpm)
+                self._limiters[api_key] = limiter
+            elif (rpm or tpm) and (limiter.rpm, limiter.tpm) != (rpm or None, tpm or None):
+                logger.warning(
+                    "Ignoring rate limits rpm=%s tpm=%s: the API key already uses rpm=%s tpm=%s",
+                    rpm,
+                    tpm,
+                    limiter.rpm,
+                    limiter.tpm,
+                )
+            return limiter
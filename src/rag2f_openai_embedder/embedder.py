@@ -1,10 +1,39 @@
 import logging
+import math
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
 
-from openai import OpenAI
+from openai import APIStatusError, OpenAI
 from rag2f.core.protocols.embedder import Vector
 
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .client_pool import ClientPool
+from .rate_limiter import RateLimiter, estimate_tokens
+from .snapshot import EmbeddingSnapshot, text_key, write_snapshot
+
 logger = logging.getLogger(__name__)
 
+_TRUE_STRINGS = {"true", "1", "yes", "on"}
+_FALSE_STRINGS = {"false", "0", "no", "off"}
+
+
+def _parse_bool(name: str, value) -> bool:
+    """Parse a boolean setting, accepting the usual string forms from env variables."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+    raise ValueError(f"Parameter '{name}' must be a boolean, got: {value}")
+
 
 class OpenAIEmbedder:
     """Embedder for OpenAI using the `openai` library (OpenAI class).
@@ -21,6 +50,25 @@ class OpenAIEmbedder:
 
     Optional configuration parameters:
       - base_url: Base URL for the API endpoint (default: None, uses OpenAI's official API)
+      - cache_size: Number of embeddings kept in the in-memory cache (default: 1024, 0 disables)
+      - snapshot_path: Precomputed embedding snapshot memory-mapped at activation (default: None)
+      - batch_size: Maximum number of inputs per request in getEmbeddings and
+        iterEmbeddings (default: 2048)
+      - rpm_limit: Requests per minute allowed for the API key (default: None, unlimited)
+      - tpm_limit: Tokens per minute allowed for the API key (default: None, unlimited)
+      - normalize_unicode: Apply Unicode NFC normalization to inputs (default: False)
+      - collapse_whitespace: Collapse whitespace runs and strip inputs (default: False)
+      - lowercase: Lowercase inputs (default: False)
+      - circuit_breaker: Fail fast during upstream outages (default: True)
+      - breaker_failure_rate: Failure rate that opens the breaker (default: 0.5)
+      - breaker_window: Number of recent calls considered (default: 20)
+      - breaker_min_calls: Calls needed before the rate is evaluated (default: 10)
+      - breaker_open_seconds: Time before probing for recovery (default: 30.0)
+      - breaker_slow_call_seconds: Calls slower than this count as failures (default: None)
+      - breaker_half_open_probes: Successful probes needed to close again (default: 1)
+      - fallback_base_url: Endpoint serving the same model and size used while the
+        breaker is open (default: None, only cached embeddings are served)
+      - fallback_api_key: API key for fallback_base_url (default: api_key)
 
     Configuration can be provided via:
     1. JSON file (specified in RAG2F initialization)
@@ -33,11 +81,13 @@ class OpenAIEmbedder:
       RAG2F__PLUGINS__RAG2F_OPENAI_EMBEDDER__BASE_URL=http://localhost:8000/v1
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, pool: ClientPool | None = None):
         """Initialize the embedder using a configuration dictionary.
 
         Args:
             config: Dictionary containing configuration parameters
+            pool: Optional client pool shared with other embedders; when given, the
+                HTTP client and the rate limiter are taken from it
         """
         self._config = config
         # Extract and validate required parameters
@@ -48,6 +98,17 @@ class OpenAIEmbedder:
         self._timeout = config.get("timeout", 30.0)
         self._max_retries = config.get("max_retries", 2)
         self._base_url = config.get("base_url")  # Optional: for custom endpoints like localhost
+        self._cache_size = config.get("cache_size", 1024)
+        self._snapshot_path = config.get("snapshot_path")
+        self._batch_size = config.get("batch_size", 2048)
+        self._rpm_limit = config.get("rpm_limit")
+        self._tpm_limit = config.get("tpm_limit")
+        self._normalize_unicode = config.get("normalize_unicode", False)
+        self._collapse_whitespace = config.get("collapse_whitespace", False)
+        self._lowercase = config.get("lowercase", False)
+        self._circuit_breaker = config.get("circuit_breaker", True)
+        self._fallback_base_url = config.get("fallback_base_url")
+        self._fallback_api_key = config.get("fallback_api_key", self._api_key)
 
         # Validate required parameters
         missing = []
@@ -84,25 +145,333 @@ class OpenAIEmbedder:
                 f"Parameter 'max_retries' must be an integer, got: {self._max_retries}"
             ) from err
 
+        # Ensure cache_size is a non-negative integer
+        try:
+            self._cache_size = int(self._cache_size)
+        except (ValueError, TypeError) as err:
+            raise ValueError(
+                f"Parameter 'cache_size' must be an integer, got: {self._cache_size}"
+            ) from err
+        if self._cache_size < 0:
+            raise ValueError(f"Parameter 'cache_size' must be >= 0, got: {self._cache_size}")
+
+        # Ensure batch_size is a positive integer
+        try:
+            self._batch_size = int(self._batch_size)
+        except (ValueError, TypeError) as err:
+            raise ValueError(
+                f"Parameter 'batch_size' must be an integer, got: {self._batch_size}"
+            ) from err
+        if self._batch_size < 1:
+            raise ValueError(f"Parameter 'batch_size' must be >= 1, got: {self._batch_size}")
+
+        # Ensure rate limits are integers when set
+        for name in ("rpm_limit", "tpm_limit"):
+            value = getattr(self, f"_{name}")
+            if value is None:
+                continue
+            try:
+                setattr(self, f"_{name}", int(value))
+            except (ValueError, TypeError) as err:
+                raise ValueError(f"Parameter '{name}' must be an integer, got: {value}") from err
+
+        # Ensure normalization and breaker flags are booleans
+        for name in ("normalize_unicode", "collapse_whitespace", "lowercase", "circuit_breaker"):
+            setattr(self, f"_{name}", _parse_bool(name, getattr(self, f"_{name}")))
+
+        # Circuit breaker: breaker_<name> settings as (name, type, default)
+        self._breaker: CircuitBreaker | None = None
+        self._fallback_breaker: CircuitBreaker | None = None
+        if self._circuit_breaker:
+            breaker_kwargs = {}
+            for name, cast, default in (
+                ("failure_rate", float, 0.5),
+                ("window", int, 20),
+                ("min_calls", int, 10),
+                ("open_seconds", float, 30.0),
+                ("slow_call_seconds", float, None),
+                ("half_open_probes", int, 1),
+            ):
+                value = config.get(f"breaker_{name}", default)
+                if value is None:
+                    breaker_kwargs[name] = None
+                    continue
+                try:
+                    breaker_kwargs[name] = cast(value)
+                except (ValueError, TypeError) as err:
+                    raise ValueError(
+                        f"Parameter 'breaker_{name}' must be a number, got: {value}"
+                    ) from err
+                if breaker_kwargs[name] <= 0:
+                    raise ValueError(f"Parameter 'breaker_{name}' must be > 0, got: {value}")
+            # Otherwise the breaker could never open
+            if breaker_kwargs["failure_rate"] > 1:
+                raise ValueError(
+                    "Parameter 'breaker_failure_rate' must be in (0, 1], "
+                    f"got: {breaker_kwargs['failure_rate']}"
+                )
+            if breaker_kwargs["min_calls"] > breaker_kwargs["window"]:
+                raise ValueError(
+                    f"Parameter 'breaker_min_calls' ({breaker_kwargs['min_calls']}) must not "
+                    f"exceed 'breaker_window' ({breaker_kwargs['window']})"
+                )
+            self._breaker = CircuitBreaker(**breaker_kwargs)
+            if self._fallback_base_url:
+                # The fallback may fail too: give it its own breaker
+                self._fallback_breaker = CircuitBreaker(**breaker_kwargs)
+
+        # Deduplication counters, see stats
+        self._stats = {"inputs": 0, "inputs_sent": 0, "tokens_saved": 0, "requests_saved": 0}
+        self._stats_lock = threading.Lock()
+
+        # In-memory LRU cache: text -> [vector, hits]
+        self._cache: OrderedDict[str, list] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._snapshot: EmbeddingSnapshot | None = None
+
+        self._client = self._make_client(pool, self._api_key, self._base_url)
+        self._fallback_client = (
+            self._make_client(pool, self._fallback_api_key, self._fallback_base_url)
+            if self._fallback_base_url
+            else None
+        )
+        if pool is not None:
+            # Share the per-key limiter with the other profiles
+            self._limiter = pool.limiter(self._api_key, self._rpm_limit, self._tpm_limit)
+            self._fallback_limiter = (
+                pool.limiter(self._fallback_api_key, None, None)
+                if self._fallback_base_url
+                else None
+            )
+        else:
+            self._limiter = (
+                RateLimiter(rpm=self._rpm_limit, tpm=self._tpm_limit)
+                if self._rpm_limit or self._tpm_limit
+                else None
+            )
+            # Fallback traffic only spends the primary budget when it uses the same key
+            self._fallback_limiter = (
+                self._limiter if self._fallback_api_key == self._api_key else None
+            )
+
+        logger.info("OpenAIEmbedder initialized with model '%s'", self._model)
+
+    def _make_client(
+        self, pool: ClientPool | None, api_key: str | None, base_url: str | None
+    ) -> OpenAI:
+        """Create an OpenAI client, taking it from ``pool`` when given."""
+        if pool is not None:
+            # Share the HTTP pool with the other profiles
+            return pool.client(api_key, base_url, self._timeout, self._max_retries)
+
         # Initialize OpenAI client
         client_kwargs = {
             "timeout": self._timeout,
             "max_retries": self._max_retries,
         }
-        if self._base_url:
-            client_kwargs["base_url"] = self._base_url
-        if self._api_key:
-            client_kwargs["api_key"] = self._api_key
+        if base_url:
+            client_kwargs["base_url"] = base_url
+        if api_key:
+            client_kwargs["api_key"] = api_key
 
-        self._client = OpenAI(**client_kwargs)
-
-        logger.info("OpenAIEmbedder initialized with model '%s'", self._model)
+        return OpenAI(**client_kwargs)
 
     @property
     def size(self) -> int:
         """Return the embedding vector size."""
         return self._size
 
+    @property
+    def model(self) -> str:
+        """Return the embedding model name."""
+        return self._model
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the deduplication counters of the batch and streaming paths.
+
+        - inputs: texts received
+        - inputs_sent: texts actually sent upstream
+        - tokens_saved: estimated tokens not sent thanks to deduplication and caching
+        - requests_saved: upstream requests avoided compared to sending every text
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    @property
+    def breaker_state(self) -> str | None:
+        """Return the circuit breaker state, or None if the breaker is disabled."""
+        return self._breaker.state if self._breaker is not None else None
+
+    @property
+    def snapshot_path(self) -> str | None:
+        """Return the configured snapshot path, if any."""
+        return self._snapshot_path
+
+    def _create(self, inputs: str | list[str], tokens: int):
+        """Call the embeddings API through the circuit breaker and the rate limiter.
+
+        The breaker is checked before the limiter, so rejected calls neither wait
+        nor spend quota. While the breaker is open, calls go to the fallback
+        endpoint if one is configured (guarded by its own breaker), otherwise
+        they fail at once with CircuitOpenError.
+
+        Args:
+            inputs: Text or texts to embed
+            tokens: Estimated tokens of the request, for the rate limiter
+        """
+        breaker = self._breaker
+        token = breaker.allow() if breaker is not None else None
+        if breaker is None or token is not None:
+            return self._call(self._client, self._limiter, breaker, token, inputs, tokens)
+
+        if self._fallback_client is None:
+            raise CircuitOpenError(f"Circuit breaker is open for model '{self._model}'")
+        fallback_token = self._fallback_breaker.allow()
+        if fallback_token is None:
+            raise CircuitOpenError(
+                f"Circuit breakers are open for model '{self._model}' and its fallback"
+            )
+        logger.debug("Circuit breaker open, using fallback endpoint")
+        return self._call(
+            self._fallback_client,
+            self._fallback_limiter,
+            self._fallback_breaker,
+            fallback_token,
+            inputs,
+            tokens,
+        )
+
+    def _call(
+        self,
+        client: OpenAI,
+        limiter: RateLimiter | None,
+        breaker: CircuitBreaker | None,
+        token: int | None,
+        inputs: str | list[str],
+        tokens: int,
+    ):
+        """Call ``client`` and record the outcome on ``breaker`` with ``token``."""
+        if limiter is not None:
+            limiter.acquire(tokens)
+        start = time.monotonic()
+        try:
+            resp = client.embeddings.create(model=self._model, input=inputs)
+        except APIStatusError as e:
+            if breaker is not None:
+                # 4xx errors (except timeouts and rate limits) are not upstream outages
+                breaker.record(token, e.status_code < 500 and e.status_code not in (408, 429))
+            raise
+        except Exception:
+            if breaker is not None:
+                breaker.record(token, False)
+            raise
+        if breaker is not None:
+            breaker.record(token, True, time.monotonic() - start)
+        return resp
+
+    def _normalize(self, text: str) -> str:
+        """Apply the configured input normalization.
+
+        A non-empty text is never normalized to an empty one (the API rejects
+        empty inputs), so whitespace-only texts are kept unchanged.
+        """
+        original = text
+        if self._normalize_unicode:
+            text = unicodedata.normalize("NFC", text)
+        if self._collapse_whitespace:
+            text = " ".join(text.split())
+        if self._lowercase:
+            text = text.lower()
+        return text or original
+
+    def _cache_get(self, text: str) -> Vector | None:
+        with self._cache_lock:
+            entry = self._cache.get(text)
+            if entry is None:
+                return None
+            self._cache.move_to_end(text)
+            entry[1] += 1
+            return entry[0]
+
+    def _cache_put(self, text: str, vector: Vector) -> None:
+        if self._cache_size == 0:
+            return
+        with self._cache_lock:
+            entry = self._cache.get(text)
+            if entry is not None:
+                entry[0] = vector
+                self._cache.move_to_end(text)
+                return
+            self._cache[text] = [vector, 1]
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _lookup(self, text: str) -> Vector | None:
+        """Return a cached or snapshot vector for ``text`` without calling the API."""
+        vector = self._cache_get(text)
+        if vector is not None:
+            return list(vector)
+        snapshot = self._snapshot
+        if snapshot is not None:
+            vector = snapshot.get(text)
+            if vector is not None:
+                self._cache_put(text, vector)
+                return list(vector)
+        return None
+
+    def load_snapshot(self, path: str | None = None) -> bool:
+        """Memory-map a precomputed embedding snapshot read-only.
+
+        A missing, corrupt or stale snapshot (different model or size) is
+        logged and ignored, so this never delays or breaks startup.
+
+        Args:
+            path: Snapshot file path (default: the configured ``snapshot_path``)
+        Returns:
+            True if the snapshot was mapped and will serve hits
+        """
+        path = path or self._snapshot_path
+        if not path:
+            return False
+        snapshot = EmbeddingSnapshot.open(path, self._model, self._size)
+        if snapshot is None:
+            return False
+        # The previous mapping is released once in-flight lookups drop their reference.
+        self._snapshot = snapshot
+        return True
+
+    def export_snapshot(self, path: str | None = None, limit: int | None = None) -> int:
+        """Export the hottest cached embeddings to a snapshot file.
+
+        Cached entries come first, ranked by hits; they are followed by the
+        entries of the currently mapped snapshot, so re-exporting from a freshly
+        restarted instance never shrinks the snapshot to its few cached entries.
+        The cache holds at most ``cache_size`` entries, which bounds how many
+        new embeddings one export can add.
+
+        Args:
+            path: Destination file path (default: the configured ``snapshot_path``)
+            limit: Maximum number of entries to export (default: no limit)
+        Returns:
+            Number of entries written
+        """
+        path = path or self._snapshot_path
+        if not path:
+            raise ValueError("No snapshot path given and 'snapshot_path' is not configured.")
+        with self._cache_lock:
+            hottest = sorted(self._cache.items(), key=lambda item: item[1][1], reverse=True)
+        entries = [(text_key(text), entry[0]) for text, entry in hottest]
+        snapshot = self._snapshot
+        if snapshot is not None and (limit is None or len(entries) < limit):
+            cached_keys = {key for key, _ in entries}
+            entries.extend(item for item in snapshot.items() if item[0] not in cached_keys)
+        if limit is not None:
+            entries = entries[:limit]
+        count = write_snapshot(path, self._model, self._size, (), keyed_entries=entries)
+        logger.info("Exported %d embeddings to snapshot '%s'", count, path)
+        return count
+
     def getEmbedding(self, text: str) -> Vector:
         """Generate embedding vector for the given text.
 
@@ -111,9 +480,101 @@ class OpenAIEmbedder:
         Returns:
             List of floats representing the embedding vector
         """
+        text = self._normalize(text)
+        cached = self._lookup(text)
+        if cached is not None:
+            return cached
         try:
-            resp = self._client.embeddings.create(model=self._model, input=text)
-            return list(resp.data[0].embedding)
+            resp = self._create(text, estimate_tokens(text))
+            vector = list(resp.data[0].embedding)
+        except CircuitOpenError as e:
+            logger.debug("Embedding rejected: %s", e)
+            raise
         except Exception as e:
             logger.error("Error generating embedding: %s", e)
             raise
+        self._cache_put(text, vector)
+        return list(vector)
+
+    def getEmbeddings(self, texts: list[str]) -> list[Vector]:
+        """Generate embedding vectors for several texts.
+
+        Texts are normalized and deduplicated: each unique text is served from
+        the cache or sent upstream once, in requests of at most ``batch_size``
+        inputs, and its vector is returned at every position that had it.
+
+        Args:
+            texts: Input texts to embed
+        Returns:
+            One embedding vector per input text, in the same order
+        """
+        return self._embed_many(texts)
+
+    def iterEmbeddings(self, texts: Iterable[str]) -> Iterator[Vector]:
+        """Stream embedding vectors for an iterable of texts.
+
+        The input is consumed in chunks of ``batch_size`` texts, each embedded
+        like getEmbeddings, so arbitrarily large corpora use bounded memory.
+
+        Args:
+            texts: Input texts to embed
+        Yields:
+            One embedding vector per input text, in the same order
+        """
+        chunk: list[str] = []
+        for text in texts:
+            chunk.append(text)
+            if len(chunk) == self._batch_size:
+                yield from self._embed_many(chunk)
+                chunk = []
+        if chunk:
+            yield from self._embed_many(chunk)
+
+    def _embed_many(self, texts: list[str]) -> list[Vector]:
+        """Embed texts, sending each unique normalized text upstream at most once."""
+        results: list[Vector | None] = [None] * len(texts)
+        positions: dict[str, list[int]] = {}
+        for i, text in enumerate(texts):
+            positions.setdefault(self._normalize(text), []).append(i)
+
+        pending: list[str] = []
+        for text, indexes in positions.items():
+            vector = self._lookup(text)
+            if vector is None:
+                pending.append(text)
+                continue
+            for i in indexes:
+                results[i] = list(vector)
+
+        for start in range(0, len(pending), self._batch_size):
+            batch = pending[start : start + self._batch_size]
+            try:
+                resp = self._create(batch, sum(estimate_tokens(text) for text in batch))
+            except CircuitOpenError as e:
+                logger.debug("Embeddings rejected: %s", e)
+                raise
+            except Exception as e:
+                logger.error("Error generating embeddings: %s", e)
+                raise
+            for item in resp.data:
+                text = batch[item.index]
+                vector = list(item.embedding)
+                self._cache_put(text, vector)
+                # Fan the vector out to every position that had this text
+                for i in positions[text]:
+                    results[i] = list(vector)
+
+        # Measured on normalized texts, so normalization itself is not counted as a saving
+        tokens_saved = sum(
+            estimate_tokens(text) * len(indexes) for text, indexes in positions.items()
+        ) - sum(estimate_tokens(text) for text in pending)
+        requests_saved = math.ceil(len(texts) / self._batch_size) - math.ceil(
+            len(pending) / self._batch_size
+        )
+        with self._stats_lock:
+            self._stats["inputs"] += len(texts)
+            self._stats["inputs_sent"] += len(pending)
+            self._stats["tokens_saved"] += tokens_saved
+            self._stats["requests_saved"] += requests_saved
+
+        return results
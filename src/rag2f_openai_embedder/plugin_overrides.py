@@ -1,4 +1,5 @@
 import logging
+from typing import TYPE_CHECKING
 
 from rag2f.core.morpheus.decorators.plugin_decorator import plugin
 from rag2f.core.morpheus.plugin import Plugin
@@ -6,8 +7,14 @@ from rag2f.core.rag2f import RAG2F
 
 from .plugin_context import set_plugin_id
 
+if TYPE_CHECKING:
+    from .client_pool import ClientPool
+
 logger = logging.getLogger(__name__)
 
+# Settings that belong to a single embedder and are not inherited by profiles
+_PROFILE_ONLY_KEYS = {"snapshot_path"}
+
 
 @plugin
 def activated(plugin: Plugin, rag2f_instance: RAG2F):
@@ -23,6 +30,15 @@ def activated(plugin: Plugin, rag2f_instance: RAG2F):
     - model: Model name (e.g., 'text-embedding-3-small', 'text-embedding-3-large', 'text-embedding-ada-002')
     - size: Embedding vector dimension
 
+    Optional configuration:
+    - snapshot_path: Precomputed embedding snapshot to memory-map at activation.
+      A missing or stale snapshot is ignored and never delays startup.
+    - profiles: Named embedding profiles, each registered as '<plugin_id>.<name>'.
+      A profile inherits the top-level settings (except snapshot_path) and overrides
+      them, e.g. its own model, size and batch_size. All profiles share one HTTP
+      pool and one rate limiter (rpm_limit/tpm_limit) per API key. The top-level
+      embedder is still registered under plugin_id when a top-level model is set.
+
     Example JSON configuration:
     {
       "plugins": {
@@ -34,6 +50,20 @@ def activated(plugin: Plugin, rag2f_instance: RAG2F):
       }
     }
 
+    Example JSON configuration with profiles:
+    {
+      "plugins": {
+        "rag2f_openai_embedder": {
+          "api_key": "sk-...",
+          "tpm_limit": 1000000,
+          "profiles": {
+            "query": {"model": "text-embedding-3-small", "size": 1536, "batch_size": 16},
+            "index": {"model": "text-embedding-3-large", "size": 3072, "batch_size": 2048}
+          }
+        }
+      }
+    }
+
     Example environment variables:
     RAG2F__PLUGINS__RAG2F_OPENAI_EMBEDDER__API_KEY=sk-...
     RAG2F__PLUGINS__RAG2F_OPENAI_EMBEDDER__MODEL=text-embedding-3-small
@@ -61,19 +91,94 @@ def activated(plugin: Plugin, rag2f_instance: RAG2F):
         )
         return
 
+    try:
+        # Lazy import to avoid issues if dependencies not installed
+        from .client_pool import ClientPool
+    except ImportError as e:
+        logger.error("Failed to import ClientPool. Ensure 'openai' package is installed: %s", e)
+        return
+
+    profiles = config.get("profiles") or {}
+    if not isinstance(profiles, dict):
+        logger.error(
+            "Parameter 'profiles' of plugin '%s' must be a mapping, ignoring it", plugin_id
+        )
+        profiles = {}
+    base_config = {key: value for key, value in config.items() if key != "profiles"}
+
+    embedder_configs: list[tuple[str, dict]] = []
+    # The flat configuration keeps registering under plugin_id
+    if not profiles or base_config.get("model"):
+        embedder_configs.append((plugin_id, base_config))
+
+    inherited = {key: value for key, value in base_config.items() if key not in _PROFILE_ONLY_KEYS}
+    for name, profile in profiles.items():
+        embedder_id = f"{plugin_id}.{name}"
+        if not isinstance(profile, dict):
+            logger.error("Profile '%s' must be a mapping, it will not be registered", embedder_id)
+            continue
+        embedder_configs.append((embedder_id, {**inherited, **profile}))
+
+    # Every embedder of an API key must see the same limits, whichever is created first
+    embedder_configs = _resolve_rate_limits(embedder_configs)
+
+    # One pool per plugin: profiles share HTTP connections and per-key rate limits
+    pool = ClientPool()
+    for embedder_id, embedder_config in embedder_configs:
+        _register_embedder(rag2f_instance, embedder_id, embedder_config, pool)
+
+    return
+
+
+def _resolve_rate_limits(embedder_configs: list[tuple[str, dict]]) -> list[tuple[str, dict]]:
+    """Apply the same rpm_limit/tpm_limit to all configurations sharing an API key.
+
+    For each key the first limit set by any configuration wins; conflicting
+    values are logged and ignored.
+    """
+    limits: dict[str | None, dict[str, object]] = {}
+    for embedder_id, embedder_config in embedder_configs:
+        key_limits = limits.setdefault(embedder_config.get("api_key"), {})
+        for name in ("rpm_limit", "tpm_limit"):
+            value = embedder_config.get(name)
+            if not value:
+                continue
+            if name not in key_limits:
+                key_limits[name] = value
+            elif str(key_limits[name]) != str(value):
+                logger.warning(
+                    "Ignoring %s=%s of '%s': the API key already uses %s=%s",
+                    name,
+                    value,
+                    embedder_id,
+                    name,
+                    key_limits[name],
+                )
+    return [
+        (embedder_id, {**embedder_config, **limits[embedder_config.get("api_key")]})
+        for embedder_id, embedder_config in embedder_configs
+    ]
+
+
+def _register_embedder(
+    rag2f_instance: RAG2F, embedder_id: str, config: dict, pool: "ClientPool"
+) -> None:
+    """Create an OpenAIEmbedder from ``config`` and register it as ``embedder_id``."""
     try:
         # Import embedder (lazy import to avoid issues if dependencies not installed)
         from .embedder import OpenAIEmbedder
 
         # Initialize embedder with Spock configuration
-        embedder = OpenAIEmbedder(config)
-        rag2f_instance.optimus_prime.register(plugin_id, embedder)
+        embedder = OpenAIEmbedder(config, pool=pool)
+        # Map the precomputed snapshot (if any) so hot queries hit immediately
+        embedder.load_snapshot()
+        rag2f_instance.optimus_prime.register(embedder_id, embedder)
 
         logger.info(
             "OpenAI embedder registered as '%s' (size=%d, model=%s)",
-            plugin_id,
+            embedder_id,
             embedder.size,
-            config.get("model"),
+            embedder.model,
         )
 
     except ImportError as e:
@@ -81,8 +186,10 @@ def activated(plugin: Plugin, rag2f_instance: RAG2F):
             "Failed to import OpenAIEmbedder. Ensure 'openai' package is installed: %s", e
         )
     except ValueError as e:
-        logger.error("Failed to initialize OpenAIEmbedder due to configuration error: %s", e)
+        logger.error(
+            "Failed to initialize OpenAIEmbedder '%s' due to configuration error: %s",
+            embedder_id,
+            e,
+        )
     except Exception as e:
-        logger.error("Unexpected error bootstrapping OpenAI embedder: %s", e)
-
-    return
+        logger.error("Unexpected error bootstrapping OpenAI embedder '%s': %s", embedder_id, e)
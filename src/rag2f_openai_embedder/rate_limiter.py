@@ -0,0 +1,83 @@
+"""Quota-aware rate limiting for embedding requests.
+
+OpenAI quotas are expressed per API key as requests per minute (RPM) and
+tokens per minute (TPM). ``RateLimiter`` enforces both with two token
+buckets so that every embedder sharing a key stays within the quota.
+"""
+
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of tokens of a text (about 4 characters per token)."""
+    return max(1, math.ceil(len(text) / 4))
+
+
+class RateLimiter:
+    """Thread-safe limiter for requests and tokens per minute.
+
+    A limit of ``None`` (or 0) disables the corresponding bucket.
+    """
+
+    def __init__(self, rpm: int | None = None, tpm: int | None = None):
+        """Initialize the limiter.
+
+        Args:
+            rpm: Maximum requests per minute
+            tpm: Maximum tokens per minute
+        """
+        self._rpm = int(rpm) if rpm else None
+        self._tpm = int(tpm) if tpm else None
+        self._requests = float(self._rpm or 0)
+        self._tokens = float(self._tpm or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rpm(self) -> int | None:
+        """Return the requests-per-minute limit."""
+        return self._rpm
+
+    @property
+    def tpm(self) -> int | None:
+        """Return the tokens-per-minute limit."""
+        return self._tpm
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self._rpm:
+            self._requests = min(self._rpm, self._requests + elapsed * self._rpm / 60.0)
+        if self._tpm:
+            self._tokens = min(self._tpm, self._tokens + elapsed * self._tpm / 60.0)
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Block until one request of ``tokens`` tokens fits within the quota.
+
+        Args:
+            tokens: Estimated tokens of the request
+        """
+        if self._tpm:
+            # A single request larger than the whole budget waits for a full bucket.
+            tokens = min(tokens, self._tpm)
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                wait = 0.0
+                if self._rpm and self._requests < 1:
+                    wait = max(wait, (1 - self._requests) * 60.0 / self._rpm)
+                if self._tpm and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60.0 / self._tpm)
+                if wait == 0.0:
+                    if self._rpm:
+                        self._requests -= 1
+                    if self._tpm:
+                        self._tokens -= tokens
+                    return
+            logger.debug("Rate limit reached, waiting %.3fs", wait)
+            time.sleep(wait)
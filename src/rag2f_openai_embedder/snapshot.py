@@ -0,0 +1,199 @@
+"""Precomputed embedding snapshots, memory-mapped read-only at startup.
+
+A snapshot is a compact binary file holding the hottest embeddings of one
+``(model, size)`` pair, keyed by a hash of the input text. It is written by
+``OpenAIEmbedder.export_snapshot()`` and opened with ``EmbeddingSnapshot.open()``,
+which memory-maps the file instead of parsing it, so hits are served as soon
+as the plugin is activated.
+
+File layout (little-endian):
+
+    magic        8 bytes   b"R2FEMB01"
+    header       12 bytes  model_len (u32), size (u32), count (u32)
+    model        model_len bytes of UTF-8, zero-padded to an 8-byte boundary
+    keys         count * 16 bytes, sorted text digests
+    vectors      count * size float32, in the same order as the keys
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+
+from rag2f.core.protocols.embedder import Vector
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"R2FEMB01"
+_HEADER = struct.Struct("<III")
+_KEY_SIZE = 16
+
+
+def text_key(text: str) -> bytes:
+    """Return the snapshot key for a text (16-byte BLAKE2b digest)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=_KEY_SIZE).digest()
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def write_snapshot(
+    path: str,
+    model: str,
+    size: int,
+    entries: Iterable[tuple[str, Vector]],
+    keyed_entries: Iterable[tuple[bytes, Vector]] = (),
+) -> int:
+    """Write a snapshot file atomically.
+
+    Args:
+        path: Destination file path.
+        model: Embedding model the vectors were produced with.
+        size: Embedding vector size.
+        entries: ``(text, vector)`` pairs to store.
+        keyed_entries: ``(key, vector)`` pairs already keyed with ``text_key()``,
+            e.g. from another snapshot; ``entries`` win on duplicate keys.
+
+    Returns:
+        The number of entries written. Vectors whose length differs from
+        ``size`` are skipped.
+    """
+    records: dict[bytes, Vector] = {}
+    skipped = 0
+    for text, vector in entries:
+        if len(vector) != size:
+            skipped += 1
+            continue
+        records[text_key(text)] = vector
+    for key, vector in keyed_entries:
+        if len(vector) != size:
+            skipped += 1
+            continue
+        records.setdefault(key, vector)
+    if skipped:
+        logger.warning("Skipped %d embeddings whose size is not %d", skipped, size)
+    keys = sorted(records)
+
+    model_bytes = model.encode("utf-8")
+    vector_struct = struct.Struct(f"<{size}f")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(_HEADER.pack(len(model_bytes), size, len(keys)))
+        fh.write(model_bytes.ljust(_pad8(len(model_bytes)), b"\0"))
+        for key in keys:
+            fh.write(key)
+        for key in keys:
+            fh.write(vector_struct.pack(*records[key]))
+    # Replace atomically so processes mapping the old file keep a consistent view.
+    os.replace(tmp_path, path)
+    return len(keys)
+
+
+class EmbeddingSnapshot:
+    """Read-only view over a memory-mapped snapshot file."""
+
+    def __init__(self, mm: mmap.mmap, model: str, size: int, count: int, keys_offset: int):
+        self._mm = mm
+        self._model = model
+        self._size = size
+        self._count = count
+        self._keys_offset = keys_offset
+        self._vectors_offset = keys_offset + count * _KEY_SIZE
+        self._vector_struct = struct.Struct(f"<{size}f")
+
+    @classmethod
+    def open(cls, path: str, model: str, size: int) -> "EmbeddingSnapshot | None":
+        """Memory-map a snapshot if it exists and matches ``model`` and ``size``.
+
+        A missing, truncated or stale snapshot is never an error: a message is
+        logged and ``None`` is returned so startup proceeds without it.
+
+        Args:
+            path: Snapshot file path.
+            model: Expected embedding model.
+            size: Expected embedding vector size.
+
+        Returns:
+            The opened snapshot, or ``None`` if it cannot be used.
+        """
+        try:
+            with open(path, "rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    logger.warning("Embedding snapshot '%s' is empty, ignoring it", path)
+                    return None
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            logger.info("No embedding snapshot found at '%s'", path)
+            return None
+        except OSError as e:
+            logger.warning("Cannot open embedding snapshot '%s': %s", path, e)
+            return None
+
+        try:
+            if mm[: len(MAGIC)] != MAGIC:
+                raise ValueError("bad magic")
+            model_len, snap_size, count = _HEADER.unpack_from(mm, len(MAGIC))
+            model_offset = len(MAGIC) + _HEADER.size
+            snap_model = mm[model_offset : model_offset + model_len].decode("utf-8")
+            keys_offset = model_offset + _pad8(model_len)
+            expected_len = keys_offset + count * (_KEY_SIZE + snap_size * 4)
+            if len(mm) != expected_len:
+                raise ValueError(f"expected {expected_len} bytes, found {len(mm)}")
+        except (ValueError, struct.error, UnicodeDecodeError) as e:
+            logger.warning("Embedding snapshot '%s' is corrupt, ignoring it: %s", path, e)
+            mm.close()
+            return None
+
+        if snap_model != model or snap_size != size:
+            logger.warning(
+                "Embedding snapshot '%s' is stale (model=%s, size=%d; expected model=%s, "
+                "size=%d), ignoring it",
+                path,
+                snap_model,
+                snap_size,
+                model,
+                size,
+            )
+            mm.close()
+            return None
+
+        logger.info("Embedding snapshot '%s' mapped with %d entries", path, count)
+        return cls(mm, snap_model, snap_size, count, keys_offset)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def items(self) -> Iterator[tuple[bytes, Vector]]:
+        """Iterate over the stored ``(key, vector)`` pairs."""
+        for i in range(self._count):
+            offset = self._keys_offset + i * _KEY_SIZE
+            key = self._mm[offset : offset + _KEY_SIZE]
+            vector_offset = self._vectors_offset + i * self._vector_struct.size
+            yield key, list(self._vector_struct.unpack_from(self._mm, vector_offset))
+
+    def get(self, text: str) -> Vector | None:
+        """Return the stored vector for ``text``, or ``None`` on a miss."""
+        key = text_key(text)
+        mm = self._mm
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = self._keys_offset + mid * _KEY_SIZE
+            probe = mm[offset : offset + _KEY_SIZE]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                vector_offset = self._vectors_offset + mid * self._vector_struct.size
+                return list(self._vector_struct.unpack_from(mm, vector_offset))
+        return None
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self._mm.close()
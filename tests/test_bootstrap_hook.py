@@ -12,3 +12,107 @@ async def test_bootstrap_embedders_called(rag2f_openai_embedder):
     assert optimus.has("rag2f_openai_embedder"), (
         f"'rag2f_openai_embedder' should be registered in embedders. Found keys: {optimus.list_keys()}"
     )
+
+
+async def _create_rag2f(plugin_config):
+    from rag2f.core.rag2f import RAG2F
+    from rag2f.core.spock.spock import Spock
+
+    config = Spock.default_config()
+    config["plugins"]["rag2f_openai_embedder"] = plugin_config
+    return await RAG2F.create(plugins_folder="src/", config=config, config_path="test/test.json")
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_loads_snapshot(tmp_path):
+    from rag2f_openai_embedder.snapshot import write_snapshot
+
+    path = tmp_path / "embeddings.snap"
+    write_snapshot(str(path), "text-embedding-3-small", 3, [("hot", [0.5, 0.25, 0.125])])
+
+    instance = await _create_rag2f(
+        {
+            "api_key": "sk-test-key-12345",
+            "model": "text-embedding-3-small",
+            "size": 3,
+            "snapshot_path": str(path),
+        }
+    )
+
+    embedder = instance.optimus_prime.get("rag2f_openai_embedder")
+    assert embedder is not None
+    assert embedder.getEmbedding("hot") == [0.5, 0.25, 0.125]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content", [None, b"", b"not a snapshot"])
+async def test_bootstrap_registers_embedder_without_usable_snapshot(tmp_path, content):
+    path = tmp_path / "embeddings.snap"
+    if content is not None:
+        path.write_bytes(content)
+
+    instance = await _create_rag2f(
+        {
+            "api_key": "sk-test-key-12345",
+            "model": "text-embedding-3-small",
+            "size": 3,
+            "snapshot_path": str(path),
+        }
+    )
+
+    optimus = instance.optimus_prime
+    assert optimus.has("rag2f_openai_embedder"), (
+        f"'rag2f_openai_embedder' should be registered without a snapshot. "
+        f"Found keys: {optimus.list_keys()}"
+    )
+    assert optimus.get("rag2f_openai_embedder")._snapshot is None
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_registers_profiles(tmp_path):
+    instance = await _create_rag2f(
+        {
+            "api_key": "sk-test-key-12345",
+            "model": "text-embedding-3-small",
+            "size": 1536,
+            "batch_size": 64,
+            "snapshot_path": str(tmp_path / "flat.snap"),
+            "profiles": {
+                "query": {"batch_size": 16},
+                "index": {"model": "text-embedding-3-large", "size": 3072, "tpm_limit": 1000},
+                "broken": "not-a-mapping",
+            },
+        }
+    )
+
+    optimus = instance.optimus_prime
+    flat = optimus.get("rag2f_openai_embedder")
+    query = optimus.get("rag2f_openai_embedder.query")
+    index = optimus.get("rag2f_openai_embedder.index")
+    assert not optimus.has("rag2f_openai_embedder.broken")
+
+    # Profiles inherit top-level settings and override them
+    assert (query.model, query.size, query._batch_size) == ("text-embedding-3-small", 1536, 16)
+    assert (index.model, index.size, index._batch_size) == ("text-embedding-3-large", 3072, 64)
+    # snapshot_path belongs to the top-level embedder only
+    assert flat.snapshot_path == str(tmp_path / "flat.snap")
+    assert query.snapshot_path is None
+    # A limit set by one profile applies to every embedder of the API key
+    assert flat._limiter is not None
+    assert flat._limiter is query._limiter is index._limiter
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_profiles_without_top_level_model():
+    instance = await _create_rag2f(
+        {
+            "api_key": "sk-test-key-12345",
+            "profiles": {"query": {"model": "text-embedding-3-small", "size": 1536}},
+        }
+    )
+
+    optimus = instance.optimus_prime
+    assert optimus.has("rag2f_openai_embedder.query"), (
+        f"Profile should be registered. Found keys: {optimus.list_keys()}"
+    )
+    assert not optimus.has("rag2f_openai_embedder")
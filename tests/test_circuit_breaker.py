@@ -0,0 +1,111 @@
+"""
+Unit tests for the circuit breaker state machine.
+
+The breaker is driven with a fake clock: these tests verify state
+transitions (closed -> open -> half-open -> closed/open), not timing.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace time in the breaker module with a controllable clock."""
+    from rag2f_openai_embedder import circuit_breaker
+
+    fake = MagicMock()
+    fake.now = 0.0
+    fake.monotonic.side_effect = lambda: fake.now
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+class TestCircuitBreaker:
+    """Test the transitions of CircuitBreaker."""
+
+    def test_opens_when_failure_rate_is_reached(self, clock):
+        """Verify the breaker opens once enough calls failed."""
+        from rag2f_openai_embedder.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=4)
+        for success in (True, False, True):
+            token = breaker.allow()
+            assert token is not None
+            breaker.record(token, success)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record(breaker.allow(), False)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow() is None
+
+    def test_slow_calls_count_as_failures(self, clock):
+        """Verify calls slower than slow_call_seconds open the breaker."""
+        from rag2f_openai_embedder.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker(window=2, min_calls=2, slow_call_seconds=1.0)
+        breaker.record(breaker.allow(), True, elapsed=5.0)
+        breaker.record(breaker.allow(), True, elapsed=5.0)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_probe_success_closes(self, clock):
+        """Verify a successful probe after open_seconds closes the breaker."""
+        from rag2f_openai_embedder.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker(window=1, min_calls=1, open_seconds=30.0)
+        breaker.record(breaker.allow(), False)
+        clock.now = 30.0
+
+        probe = breaker.allow()
+        assert probe is not None
+        # Only one probe at a time
+        assert breaker.allow() is None
+        breaker.record(probe, True)
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_probe_failure_reopens(self, clock):
+        """Verify a failed probe opens the breaker again."""
+        from rag2f_openai_embedder.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker(window=1, min_calls=1, open_seconds=30.0)
+        breaker.record(breaker.allow(), False)
+        clock.now = 30.0
+        probe = breaker.allow()
+        assert probe is not None
+        breaker.record(probe, False)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        clock.now = 59.0
+        assert breaker.allow() is None
+
+    def test_stale_result_is_not_counted_as_probe(self, clock):
+        """Verify a call admitted before opening cannot affect the half-open probe."""
+        from rag2f_openai_embedder.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker(window=1, min_calls=1, open_seconds=30.0)
+        stale = breaker.allow()
+        breaker.record(breaker.allow(), False)
+        clock.now = 30.0
+        probe = breaker.allow()
+
+        # The slow call admitted while closed times out now
+        breaker.record(stale, False)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.record(probe, True)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"window": 5, "min_calls": 10}, {"failure_rate": 1.5}, {"failure_rate": 0.0}],
+    )
+    def test_settings_that_never_open_are_rejected(self, kwargs):
+        """Verify settings that would silently disable the breaker raise."""
+        from rag2f_openai_embedder.circuit_breaker import CircuitBreaker
+
+        with pytest.raises(ValueError):
+            CircuitBreaker(**kwargs)
@@ -0,0 +1,126 @@
+"""
+Unit tests for the shared client pool and the quota-aware rate limiter.
+
+Profiles registered by the plugin share one ClientPool: these tests verify
+that clients and limiters are shared per API key, and that the limiter
+waits instead of exceeding its quota.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+CLIENT_POOL_PATCH_TARGET = "rag2f_openai_embedder.client_pool.OpenAI"
+
+
+class TestClientPool:
+    """Test sharing of clients and limiters between profiles."""
+
+    def test_profiles_with_same_key_share_one_http_client(self):
+        """Verify one OpenAI client is created per (api_key, base_url)."""
+        from rag2f_openai_embedder.client_pool import ClientPool
+
+        with patch(CLIENT_POOL_PATCH_TARGET) as MockClient:
+            base = MagicMock()
+            MockClient.return_value = base
+            pool = ClientPool()
+
+            first = pool.client("sk-a", None, 30.0, 2)
+            second = pool.client("sk-a", None, 5.0, 0)
+
+            MockClient.assert_called_once_with(api_key="sk-a", timeout=30.0, max_retries=2)
+            assert first is base
+            base.with_options.assert_called_once_with(timeout=5.0, max_retries=0)
+            assert second is base.with_options.return_value
+
+    def test_different_keys_get_different_clients(self):
+        """Verify clients are not shared across API keys."""
+        from rag2f_openai_embedder.client_pool import ClientPool
+
+        with patch(CLIENT_POOL_PATCH_TARGET) as MockClient:
+            MockClient.side_effect = lambda **kwargs: MagicMock()
+            pool = ClientPool()
+
+            assert pool.client("sk-a", None, 30.0, 2) is not pool.client("sk-b", None, 30.0, 2)
+            assert MockClient.call_count == 2
+
+    def test_limiter_is_shared_per_api_key(self):
+        """Verify profiles using the same key share one limiter."""
+        from rag2f_openai_embedder.client_pool import ClientPool
+
+        pool = ClientPool()
+
+        limiter = pool.limiter("sk-a", 100, None)
+        assert pool.limiter("sk-a", None, None) is limiter
+        assert pool.limiter("sk-b", 100, None) is not limiter
+        assert pool.limiter("sk-c", None, None) is None
+
+    def test_embedders_from_pool_share_client_and_limiter(self):
+        """Verify OpenAIEmbedder takes its client and limiter from the pool."""
+        from rag2f_openai_embedder.client_pool import ClientPool
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        with patch(CLIENT_POOL_PATCH_TARGET):
+            pool = ClientPool()
+            small = OpenAIEmbedder(
+                {
+                    "api_key": "sk-a",
+                    "model": "text-embedding-3-small",
+                    "size": 1536,
+                    "tpm_limit": 1000,
+                },
+                pool=pool,
+            )
+            large = OpenAIEmbedder(
+                {"api_key": "sk-a", "model": "text-embedding-3-large", "size": 3072},
+                pool=pool,
+            )
+
+            assert small._limiter is not None
+            assert small._limiter is large._limiter
+
+
+class TestRateLimiter:
+    """Test the token buckets of RateLimiter."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Replace time with a fake clock advanced by sleep()."""
+        from rag2f_openai_embedder import rate_limiter
+
+        fake = MagicMock()
+        fake.now = 0.0
+        fake.monotonic.side_effect = lambda: fake.now
+        fake.sleep.side_effect = lambda seconds: setattr(fake, "now", fake.now + seconds)
+        monkeypatch.setattr(rate_limiter, "time", fake)
+        return fake
+
+    def test_requests_within_quota_do_not_wait(self, clock):
+        """Verify no wait happens while the quota is available."""
+        from rag2f_openai_embedder.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(rpm=60)
+        for _ in range(60):
+            limiter.acquire()
+
+        clock.sleep.assert_not_called()
+
+    def test_request_over_quota_waits_for_refill(self, clock):
+        """Verify the limiter waits for the bucket to refill."""
+        from rag2f_openai_embedder.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(rpm=60)
+        for _ in range(61):
+            limiter.acquire()
+
+        assert clock.now == pytest.approx(1.0)
+
+    def test_token_quota_waits_for_refill(self, clock):
+        """Verify the token bucket limits large requests."""
+        from rag2f_openai_embedder.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(tpm=600)
+        limiter.acquire(600)
+        limiter.acquire(100)
+
+        assert clock.now == pytest.approx(10.0)
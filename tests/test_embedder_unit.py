@@ -313,6 +313,206 @@ class TestOpenAIEmbedderEdgeCases:
             assert call_args[1]["input"] == special_text
 
 
+class TestOpenAIEmbedderCircuitBreaker:
+    """Test fast-fail and fallback while the circuit breaker is open."""
+
+    BREAKER_CONFIG = {
+        "api_key": "sk-test-key",
+        "model": "text-embedding-3-small",
+        "size": 1,
+        "breaker_window": 2,
+        "breaker_min_calls": 2,
+    }
+
+    @pytest.fixture
+    def clients(self):
+        """Create a failing primary client and a healthy fallback client."""
+        with patch(OPENAI_PATCH_TARGET) as MockClient:
+            primary = MagicMock()
+            primary.embeddings.create.side_effect = Exception("API Error")
+            fallback = MagicMock()
+            fallback.embeddings.create.return_value.data = [MagicMock(index=0, embedding=[0.5])]
+            MockClient.side_effect = lambda **kwargs: (
+                fallback if kwargs.get("base_url") == "http://fallback/v1" else primary
+            )
+            yield primary, fallback
+
+    def _trip(self, embedder):
+        for text in ("a", "b"):
+            with pytest.raises(Exception, match="API Error"):
+                embedder.getEmbedding(text)
+
+    def test_open_breaker_fails_fast(self, clients):
+        """Verify calls are rejected without reaching the API once open."""
+        from rag2f_openai_embedder.circuit_breaker import CircuitOpenError
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        primary, _ = clients
+        embedder = OpenAIEmbedder(self.BREAKER_CONFIG)
+        self._trip(embedder)
+
+        with pytest.raises(CircuitOpenError):
+            embedder.getEmbedding("c")
+        assert primary.embeddings.create.call_count == 2
+        assert embedder.breaker_state == "open"
+
+    def test_open_breaker_still_serves_cache(self, clients):
+        """Verify cached embeddings are served while the breaker is open."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        primary, _ = clients
+        primary.embeddings.create.side_effect = None
+        primary.embeddings.create.return_value.data = [MagicMock(embedding=[0.25])]
+        embedder = OpenAIEmbedder(self.BREAKER_CONFIG)
+        embedder.getEmbedding("cached")
+
+        primary.embeddings.create.side_effect = Exception("API Error")
+        # One success and one failure in a window of 2 reach the 50% failure rate
+        with pytest.raises(Exception, match="API Error"):
+            embedder.getEmbedding("a")
+        assert embedder.breaker_state == "open"
+
+        assert embedder.getEmbedding("cached") == [0.25]
+
+    def test_open_breaker_uses_fallback(self, clients):
+        """Verify open-state traffic goes to fallback_base_url."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        primary, fallback = clients
+        config = {**self.BREAKER_CONFIG, "fallback_base_url": "http://fallback/v1"}
+        embedder = OpenAIEmbedder(config)
+        self._trip(embedder)
+
+        assert embedder.getEmbedding("c") == [0.5]
+        fallback.embeddings.create.assert_called_once_with(
+            model="text-embedding-3-small", input="c"
+        )
+        assert primary.embeddings.create.call_count == 2
+
+    def test_open_breaker_does_not_wait_for_rate_limiter(self, clients):
+        """Verify rejected calls neither block in nor spend the rate limiter."""
+        from rag2f_openai_embedder.circuit_breaker import CircuitOpenError
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        embedder = OpenAIEmbedder({**self.BREAKER_CONFIG, "rpm_limit": 2})
+        embedder._limiter = MagicMock()
+        self._trip(embedder)
+        embedder._limiter.reset_mock()
+
+        with pytest.raises(CircuitOpenError):
+            embedder.getEmbedding("c")
+        embedder._limiter.acquire.assert_not_called()
+
+    def test_fallback_with_other_key_does_not_spend_primary_quota(self, clients):
+        """Verify fallback traffic only uses the primary limiter for the same key."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            **self.BREAKER_CONFIG,
+            "rpm_limit": 100,
+            "fallback_base_url": "http://fallback/v1",
+            "fallback_api_key": "sk-fallback-key",
+        }
+        embedder = OpenAIEmbedder(config)
+        embedder._limiter = MagicMock()
+        self._trip(embedder)
+        embedder._limiter.reset_mock()
+
+        assert embedder.getEmbedding("c") == [0.5]
+        embedder._limiter.acquire.assert_not_called()
+
+    def test_failing_fallback_fails_fast(self, clients):
+        """Verify the fallback has its own breaker."""
+        from rag2f_openai_embedder.circuit_breaker import CircuitOpenError
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        _, fallback = clients
+        fallback.embeddings.create.side_effect = Exception("Fallback Error")
+        config = {**self.BREAKER_CONFIG, "fallback_base_url": "http://fallback/v1"}
+        embedder = OpenAIEmbedder(config)
+        self._trip(embedder)
+        for text in ("c", "d"):
+            with pytest.raises(Exception, match="Fallback Error"):
+                embedder.getEmbedding(text)
+
+        with pytest.raises(CircuitOpenError):
+            embedder.getEmbedding("e")
+        assert fallback.embeddings.create.call_count == 2
+
+    def test_stale_call_does_not_spoil_half_open_probe(self, clients, monkeypatch):
+        """Verify a slow call admitted while closed is not counted as a probe."""
+        from rag2f_openai_embedder import circuit_breaker
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        clock = MagicMock()
+        clock.now = 0.0
+        clock.monotonic.side_effect = lambda: clock.now
+        monkeypatch.setattr(circuit_breaker, "time", clock)
+
+        primary, _ = clients
+        embedder = OpenAIEmbedder(self.BREAKER_CONFIG)
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[0.75])]
+
+        def create(model, input):
+            if input == "slow":
+                # While this call hangs, the breaker opens and becomes half-open
+                self._trip(embedder)
+                clock.now = 30.0
+                assert embedder.breaker_state == "half_open"
+                raise Exception("Timeout")
+            if input in ("a", "b"):
+                raise Exception("API Error")
+            return response
+
+        primary.embeddings.create.side_effect = create
+        with pytest.raises(Exception, match="Timeout"):
+            embedder.getEmbedding("slow")
+
+        assert embedder.breaker_state == "half_open"
+        assert embedder.getEmbedding("probe") == [0.75]
+        assert embedder.breaker_state == "closed"
+
+    def test_breaker_can_be_disabled(self, clients):
+        """Verify circuit_breaker=False always calls the API."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        primary, _ = clients
+        embedder = OpenAIEmbedder({**self.BREAKER_CONFIG, "circuit_breaker": False})
+        self._trip(embedder)
+
+        with pytest.raises(Exception, match="API Error"):
+            embedder.getEmbedding("c")
+        assert primary.embeddings.create.call_count == 3
+        assert embedder.breaker_state is None
+
+    @pytest.mark.parametrize(
+        ("override", "parameter"),
+        [
+            ({"breaker_window": 5, "breaker_min_calls": 10}, "breaker_min_calls"),
+            ({"breaker_window": 5}, "breaker_min_calls"),
+            ({"breaker_failure_rate": 1.5}, "breaker_failure_rate"),
+        ],
+    )
+    def test_breaker_settings_that_never_open_raise_error(self, override, parameter):
+        """Verify YOUR validation rejects settings that would disable the breaker."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {"api_key": "sk-test-key", "model": "text-embedding-3-small", "size": 1}
+
+        with pytest.raises(ValueError) as exc_info:
+            OpenAIEmbedder({**config, **override})
+        assert parameter in str(exc_info.value)
+
+    def test_invalid_breaker_setting_raises_error(self):
+        """Verify YOUR validation catches an invalid breaker setting."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        with pytest.raises(ValueError) as exc_info:
+            OpenAIEmbedder({**self.BREAKER_CONFIG, "breaker_window": "many"})
+        assert "breaker_window" in str(exc_info.value)
+
+
 # =============================================================================
 # OPTIONAL: Contract tests with real HTTP (keep if you want extra safety)
 # =============================================================================
@@ -360,3 +560,372 @@ class TestOpenAIEmbedderHTTPIntegration:
 
         assert len(result) == 1536
         assert isinstance(result, list)
+
+
+class TestOpenAIEmbedderSnapshot:
+    """Test the in-memory cache and the precomputed snapshot."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create a mock OpenAI client returning a 3-dim embedding."""
+        with patch(OPENAI_PATCH_TARGET) as MockClient:
+            mock_instance = MagicMock()
+            mock_instance.embeddings.create.return_value.data = [
+                MagicMock(embedding=[0.5, 0.25, 0.125])
+            ]
+            MockClient.return_value = mock_instance
+            yield mock_instance
+
+    def test_repeated_text_served_from_cache(self, mock_client):
+        """Verify a repeated text does not call the API again."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {"api_key": "sk-test-key", "model": "text-embedding-3-small", "size": 3}
+
+        embedder = OpenAIEmbedder(config)
+        first = embedder.getEmbedding("hello")
+        second = embedder.getEmbedding("hello")
+
+        assert first == second
+        assert mock_client.embeddings.create.call_count == 1
+
+    def test_exported_snapshot_serves_hits_without_api_call(self, mock_client, tmp_path):
+        """Verify a snapshot exported by one embedder is served by another."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        path = str(tmp_path / "embeddings.snap")
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 3,
+            "snapshot_path": path,
+        }
+
+        warm = OpenAIEmbedder(config)
+        warm.getEmbedding("hot")
+        warm.getEmbedding("hot")
+        warm.getEmbedding("cold")
+        assert warm.export_snapshot(limit=1) == 1
+
+        mock_client.embeddings.create.reset_mock()
+        cold = OpenAIEmbedder(config)
+        assert cold.load_snapshot() is True
+
+        assert cold.getEmbedding("hot") == [0.5, 0.25, 0.125]
+        mock_client.embeddings.create.assert_not_called()
+
+        cold.getEmbedding("cold")
+        mock_client.embeddings.create.assert_called_once()
+
+    def test_export_keeps_mapped_snapshot_entries(self, mock_client, tmp_path):
+        """Verify re-exporting after a restart does not drop the mapped snapshot."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        path = str(tmp_path / "embeddings.snap")
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 3,
+            "snapshot_path": path,
+        }
+        warm = OpenAIEmbedder(config)
+        for text in ("a", "b", "c"):
+            warm.getEmbedding(text)
+        warm.export_snapshot()
+
+        restarted = OpenAIEmbedder(config)
+        restarted.load_snapshot()
+        restarted.getEmbedding("d")
+        assert restarted.export_snapshot() == 4
+        # The limit keeps the cached entries first
+        assert restarted.export_snapshot(str(tmp_path / "top.snap"), limit=1) == 1
+
+        mock_client.embeddings.create.reset_mock()
+        cold = OpenAIEmbedder(config)
+        cold.load_snapshot()
+        for text in ("a", "b", "c", "d"):
+            cold.getEmbedding(text)
+        mock_client.embeddings.create.assert_not_called()
+
+        top = OpenAIEmbedder({**config, "snapshot_path": str(tmp_path / "top.snap")})
+        top.load_snapshot()
+        top.getEmbedding("d")
+        mock_client.embeddings.create.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "override",
+        [{"model": "text-embedding-3-large"}, {"size": 2}],
+    )
+    def test_stale_snapshot_is_ignored(self, mock_client, tmp_path, override):
+        """Verify a snapshot for another model or size is not loaded."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        path = str(tmp_path / "embeddings.snap")
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 3,
+            "snapshot_path": path,
+        }
+        warm = OpenAIEmbedder(config)
+        warm.getEmbedding("hot")
+        warm.export_snapshot()
+
+        embedder = OpenAIEmbedder({**config, **override})
+        assert embedder.load_snapshot() is False
+
+    @pytest.mark.parametrize("content", [None, b"", b"not a snapshot"])
+    def test_missing_or_corrupt_snapshot_is_ignored(self, mock_client, tmp_path, content):
+        """Verify a missing or unreadable snapshot never raises."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        path = tmp_path / "embeddings.snap"
+        if content is not None:
+            path.write_bytes(content)
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 3,
+            "snapshot_path": str(path),
+        }
+
+        embedder = OpenAIEmbedder(config)
+        assert embedder.load_snapshot() is False
+        assert embedder.getEmbedding("hot") == [0.5, 0.25, 0.125]
+
+    def test_invalid_cache_size_raises_error(self):
+        """Verify YOUR validation catches a negative cache size."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 3,
+            "cache_size": -1,
+        }
+
+        with pytest.raises(ValueError) as exc_info:
+            OpenAIEmbedder(config)
+        assert "cache_size" in str(exc_info.value)
+
+
+class TestOpenAIEmbedderBatching:
+    """Test the batch path and its batch_size setting."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create a mock OpenAI client echoing one embedding per input."""
+        with patch(OPENAI_PATCH_TARGET) as MockClient:
+            mock_instance = MagicMock()
+
+            def create(model, input):
+                response = MagicMock()
+                response.data = [
+                    MagicMock(index=i, embedding=[float(len(text))])
+                    for i, text in enumerate(input)
+                ]
+                return response
+
+            mock_instance.embeddings.create.side_effect = create
+            MockClient.return_value = mock_instance
+            yield mock_instance
+
+    def test_batches_respect_batch_size(self, mock_client):
+        """Verify inputs are split into requests of at most batch_size."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 1,
+            "batch_size": 2,
+        }
+
+        embedder = OpenAIEmbedder(config)
+        result = embedder.getEmbeddings(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        assert result == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        batches = [c.kwargs["input"] for c in mock_client.embeddings.create.call_args_list]
+        assert batches == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+
+    def test_cached_texts_are_not_sent_again(self, mock_client):
+        """Verify the batch path reuses the cache."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {"api_key": "sk-test-key", "model": "text-embedding-3-small", "size": 1}
+
+        embedder = OpenAIEmbedder(config)
+        embedder.getEmbedding("a")
+        embedder.getEmbeddings(["a", "bb"])
+
+        assert mock_client.embeddings.create.call_args_list[-1].kwargs["input"] == ["bb"]
+
+    def test_duplicates_sent_once_and_fanned_out(self, mock_client):
+        """Verify each unique text is sent once and returned at every position."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {"api_key": "sk-test-key", "model": "text-embedding-3-small", "size": 1}
+
+        embedder = OpenAIEmbedder(config)
+        result = embedder.getEmbeddings(["footer", "a", "footer", "footer"])
+
+        assert result == [[6.0], [1.0], [6.0], [6.0]]
+        mock_client.embeddings.create.assert_called_once_with(
+            model="text-embedding-3-small", input=["footer", "a"]
+        )
+        assert embedder.stats == {
+            "inputs": 4,
+            "inputs_sent": 2,
+            "tokens_saved": 4,
+            "requests_saved": 0,
+        }
+
+    def test_fanned_out_vectors_are_independent(self, mock_client):
+        """Verify duplicates do not share the same list object."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {"api_key": "sk-test-key", "model": "text-embedding-3-small", "size": 1}
+
+        embedder = OpenAIEmbedder(config)
+        first, second = embedder.getEmbeddings(["x", "x"])
+        first.append(0.0)
+
+        assert second == [1.0]
+
+    def test_normalization_merges_whitespace_and_case_variants(self, mock_client):
+        """Verify configured normalization is applied before deduplication."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 1,
+            "batch_size": 1,
+            "normalize_unicode": True,
+            "collapse_whitespace": True,
+            "lowercase": True,
+        }
+
+        embedder = OpenAIEmbedder(config)
+        embedder.getEmbeddings(["  Caf\u00e9\tBar ", "cafe\u0301 bar", "CAFÉ  BAR"])
+
+        mock_client.embeddings.create.assert_called_once_with(
+            model="text-embedding-3-small", input=["café bar"]
+        )
+        assert embedder.stats["requests_saved"] == 2
+
+    def test_normalization_never_empties_a_text(self, mock_client):
+        """Verify whitespace-only texts are not collapsed into empty inputs."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 1,
+            "collapse_whitespace": True,
+        }
+
+        embedder = OpenAIEmbedder(config)
+        embedder.getEmbeddings(["hello", "   \n\t "])
+        embedder.getEmbedding(" ")
+
+        batches = [c.kwargs["input"] for c in mock_client.embeddings.create.call_args_list]
+        assert batches == [["hello", "   \n\t "], " "]
+
+    def test_normalization_disabled_by_default(self, mock_client):
+        """Verify texts are sent unchanged unless normalization is configured."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {"api_key": "sk-test-key", "model": "text-embedding-3-small", "size": 1}
+
+        embedder = OpenAIEmbedder(config)
+        embedder.getEmbeddings(["Hello ", "hello"])
+
+        mock_client.embeddings.create.assert_called_once_with(
+            model="text-embedding-3-small", input=["Hello ", "hello"]
+        )
+
+    def test_streaming_deduplicates_across_chunks(self, mock_client):
+        """Verify the streaming path yields in order and reuses earlier chunks."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 1,
+            "batch_size": 2,
+        }
+
+        embedder = OpenAIEmbedder(config)
+        result = list(embedder.iterEmbeddings(iter(["a", "bb", "a", "bb", "ccc"])))
+
+        assert result == [[1.0], [2.0], [1.0], [2.0], [3.0]]
+        batches = [c.kwargs["input"] for c in mock_client.embeddings.create.call_args_list]
+        assert batches == [["a", "bb"], ["ccc"]]
+        assert embedder.stats["requests_saved"] == 1
+
+    def test_tokens_saved_excludes_normalization(self, mock_client):
+        """Verify whitespace removed by normalization is not reported as saved."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 1,
+            "collapse_whitespace": True,
+        }
+
+        embedder = OpenAIEmbedder(config)
+        embedder.getEmbeddings(["abcd" + " " * 40])
+
+        assert embedder.stats["tokens_saved"] == 0
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("true", True), ("Yes", True), ("1", True), ("false", False), ("no", False), (0, False)],
+    )
+    def test_normalization_flag_parses_env_strings(self, value, expected):
+        """Verify boolean flags accept the string forms used by env variables."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 1,
+            "lowercase": value,
+        }
+
+        with patch(OPENAI_PATCH_TARGET):
+            embedder = OpenAIEmbedder(config)
+        assert embedder._lowercase is expected
+
+    def test_invalid_normalization_flag_raises_error(self):
+        """Verify YOUR validation catches a non-boolean normalization flag."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 1,
+            "lowercase": "maybe",
+        }
+
+        with pytest.raises(ValueError) as exc_info:
+            OpenAIEmbedder(config)
+        assert "lowercase" in str(exc_info.value)
+
+    @pytest.mark.parametrize("batch_size", [0, "not-a-number"])
+    def test_invalid_batch_size_raises_error(self, batch_size):
+        """Verify YOUR validation catches an invalid batch size."""
+        from rag2f_openai_embedder.embedder import OpenAIEmbedder
+
+        config = {
+            "api_key": "sk-test-key",
+            "model": "text-embedding-3-small",
+            "size": 1,
+            "batch_size": batch_size,
+        }
+
+        with pytest.raises(ValueError) as exc_info:
+            OpenAIEmbedder(config)
+        assert "batch_size" in str(exc_info.value)